@@ -530,7 +530,6 @@ def run_fast_loop(
         pump_pct    = float(cfg("rules.fast_ts.pump_pct",         _DEFAULT_PUMP_PCT))
         min_vol     = float(cfg("rules.fast_ts.min_vol_24h",      _DEFAULT_MIN_VOL))
         cd_min      = int(  cfg("rules.fast_ts.cooldown_min",     _DEFAULT_CD_MIN))
-        throttle    = max(0.0, float(cfg("telegram.throttle_sec", 2.0)))
         prefix      = cfg("telegram.prefix", "TS")
         rel_vol_min = float(cfg("rules.fast_ts.rel_volume_min",   _DEFAULT_REL_VOL))
         stage_max   = float(cfg("rules.fast_ts.stage_pct_max",    _DEFAULT_STAGE_MAX))
@@ -888,8 +887,6 @@ def run_fast_loop(
                 except Exception as e:
                     log("FAST", f"ERROR outcome_tracker.record {sym}: {type(e).__name__}: {e}")
                 mark_cooldown(sym, "pump_fast")
-                if throttle > 0 and not stop_event.is_set():
-                    stop_event.wait(timeout=throttle)
 
         # ── 8. Periodic cleanup ──────────────────────────────────────────
         cleanup_counter += 1
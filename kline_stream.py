@@ -0,0 +1,221 @@
+"""
+kline_stream.py — in-memory kline buffers fed by Binance combined WS streams
+Trade Seeker — scanner (legacy REST rules)
+
+Flow:
+  1. scanner.poll_once() → KlineStream(symbols, timeframes, depth).start()
+  2. One combined stream per MAX_STREAMS_PER_CONN (symbol, tf) pairs:
+       wss://stream.binance.com:9443/stream?streams=btcusdt@kline_15m/...
+  3. Every push updates the (symbol, tf) deque: same openTime → replace the
+     open bar, newer openTime → append (deque maxlen = depth)
+  4. klines(symbol, tf, limit) → last `limit` rows in REST /api/v3/klines
+     shape, or None if the buffer is not warm / its stream is down
+  5. On None the scanner fetches REST once and seed()s the buffer (warmup)
+
+Design principles:
+- REST only for warmup/backfill — steady state has zero per-poll HTTP
+- Rows keep the REST layout [openTime, o, h, l, c, v, closeTime] (strings),
+  so callers parse stream and REST data through the same code path
+- A dropped connection clears its buffers — after reconnect they are
+  re-seeded from REST, so a gap never reaches the rules
+- A push or seed that would skip a bar (openTime beyond last + interval)
+  resets that buffer instead, so it too is re-seeded from REST
+- Thread-safe: one Lock for all buffers; WS threads are daemons
+"""
+
+import json
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import websocket
+
+COMBINED_BASE        = "wss://stream.binance.com:9443/stream?streams="
+MAX_STREAMS_PER_CONN = 200     # Binance allows 1024; keep URLs short and reconnects cheap
+RECONNECT_BACKOFF_S  = 5.0
+
+_Key = Tuple[str, str]         # (SYMBOL, tf)
+
+_UNIT_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def interval_ms(tf: str) -> Optional[int]:
+    """Bar length of a Binance interval ("15m", "1h", ...); None for "1M" (months vary)."""
+    unit = _UNIT_MS.get(tf[-1:])
+    if unit is None or not tf[:-1].isdigit():
+        return None
+    return int(tf[:-1]) * unit
+
+
+class _Conn:
+    def __init__(self, keys: List[_Key]):
+        self.keys      = keys
+        self.ws        = None
+        self.thread    = None
+        self.connected = False
+
+
+class KlineStream:
+    """
+    Usage in scanner:
+        stream = KlineStream(symbols, ["15m", "1h"], depth=120, log_fn=log)
+        stream.start()
+
+        k = stream.klines(sym, tf, limit)
+        if k is None:
+            k = get_klines(sym, tf, limit)   # REST warmup
+            stream.seed(sym, tf, k)
+
+        stream.stop()
+    """
+
+    def __init__(
+        self,
+        symbols:    Sequence[str],
+        timeframes: Sequence[str],
+        depth:      int,
+        log_fn=None,
+    ):
+        self.depth = depth
+        self._log  = log_fn or (lambda tag, msg: print(f"[{tag}] {msg}"))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._bufs: Dict[_Key, Deque[list]] = {}
+        self._step: Dict[str, Optional[int]] = {tf: interval_ms(tf) for tf in timeframes}
+
+        keys = [(s.upper(), tf) for tf in timeframes for s in symbols]
+        self._conns = [
+            _Conn(keys[i:i + MAX_STREAMS_PER_CONN])
+            for i in range(0, len(keys), MAX_STREAMS_PER_CONN)
+        ]
+        self._conn_of: Dict[_Key, _Conn] = {k: c for c in self._conns for k in c.keys}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        for i, c in enumerate(self._conns):
+            c.thread = threading.Thread(
+                target=self._run_conn, args=(c,), daemon=True, name=f"kline-ws-{i}",
+            )
+            c.thread.start()
+        self._log("KWS", f"started {len(self._conns)} conn(s) for {len(self._conn_of)} streams")
+
+    def stop(self) -> None:
+        self._stop.set()
+        for c in self._conns:
+            if c.ws:
+                try:
+                    c.ws.close()
+                except Exception:
+                    pass
+
+    def klines(self, symbol: str, tf: str, limit: int) -> Optional[List[list]]:
+        """
+        Last `limit` bars (oldest first, last = open bar), or None if the
+        stream is down or the buffer holds fewer than `limit` bars.
+        """
+        key  = (symbol.upper(), tf)
+        conn = self._conn_of.get(key)
+        if conn is None or not conn.connected:
+            return None
+        with self._lock:
+            buf = self._bufs.get(key)
+            if buf is None or len(buf) < limit:
+                return None
+            return list(buf)[-limit:]
+
+    def seed(self, symbol: str, tf: str, rows: List[list]) -> None:
+        """
+        Load REST klines into the buffer. Bars pushed meanwhile that are
+        newer than (or update) the last REST bar are kept on top. If those
+        pushes do not continue the REST bars, the buffer is left unseeded
+        and the next poll fetches REST again.
+        """
+        key = (symbol.upper(), tf)
+        if key not in self._conn_of or not rows:
+            return
+        step = self._step.get(tf)
+        fresh: Deque[list] = deque((list(r[:7]) for r in rows), maxlen=self.depth)
+        with self._lock:
+            for r in self._bufs.get(key, ()):
+                if r[0] == fresh[-1][0]:
+                    fresh[-1] = r
+                elif r[0] > fresh[-1][0]:
+                    if step and r[0] > fresh[-1][0] + step:
+                        self._bufs.pop(key, None)
+                        return
+                    fresh.append(r)
+            self._bufs[key] = fresh
+
+    # ------------------------------------------------------------------
+    # Internal — WS management
+    # ------------------------------------------------------------------
+
+    def _on_kline(self, k: dict) -> None:
+        key  = (k["s"], k["i"])
+        row  = [k["t"], k["o"], k["h"], k["l"], k["c"], k["v"], k["T"]]
+        step = self._step.get(k["i"])
+        with self._lock:
+            buf = self._bufs.get(key)
+            if buf and step and row[0] > buf[-1][0] + step:
+                # a bar was missed (e.g. seeded while the socket was down) —
+                # restart from this push; klines() stays None until re-seeded
+                buf = None
+            if buf is None:
+                # not seeded yet — keep pushes so seed() can merge them
+                buf = self._bufs[key] = deque(maxlen=self.depth)
+            if buf and buf[-1][0] == row[0]:
+                buf[-1] = row
+            elif not buf or row[0] > buf[-1][0]:
+                buf.append(row)
+
+    def _drop_buffers(self, c: _Conn) -> None:
+        with self._lock:
+            for key in c.keys:
+                self._bufs.pop(key, None)
+
+    def _run_conn(self, c: _Conn) -> None:
+        url = COMBINED_BASE + "/".join(f"{s.lower()}@kline_{tf}" for s, tf in c.keys)
+
+        def on_message(ws, message):
+            try:
+                self._on_kline(json.loads(message)["data"]["k"])
+            except Exception as e:
+                self._log("KWS", f"bad message: {type(e).__name__}: {e}")
+
+        def on_open(ws):
+            if self._stop.is_set():
+                # stop() ran while this socket was still being created
+                ws.close()
+                return
+            c.connected = True
+            self._log("KWS", f"stream open ({len(c.keys)} streams)")
+
+        def on_error(ws, error):
+            self._log("KWS", f"stream error: {error}")
+
+        def on_close(ws, code, msg):
+            c.connected = False
+            self._log("KWS", f"stream closed code={code}")
+
+        while not self._stop.is_set():
+            c.ws = websocket.WebSocketApp(
+                url,
+                on_message=on_message,
+                on_open=on_open,
+                on_error=on_error,
+                on_close=on_close,
+            )
+            # stop() may have closed the previous ws before this one existed;
+            # run_forever resets keep_running, so re-check right before it
+            if self._stop.is_set():
+                break
+            try:
+                c.ws.run_forever(ping_interval=30, ping_timeout=10)
+            except Exception as e:
+                self._log("KWS", f"run_forever error: {type(e).__name__}: {e}")
+            c.connected = False
+            self._drop_buffers(c)   # bars missed while down → re-seed from REST
+            self._stop.wait(RECONNECT_BACKOFF_S)
@@ -18,11 +18,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from datetime import datetime, timezone
-
 from typing import Protocol, runtime_checkable, Union, Dict, List, Optional
 
-import json, random, time, traceback
+import atexit, json, os, random, sys, threading, time, traceback
 
 
 
@@ -36,27 +34,186 @@ JSONValue = Union[JSONScalar, JSONObject, JSONArray]
 
 
 
+try:
+
+    import orjson
+
+    def _dumps(o: JSONValue) -> str:
+
+        return orjson.dumps(o).decode()
+
+except ImportError:  # optional speedup; stdlib json keeps identical output shape
+
+    def _dumps(o: JSONValue) -> str:
+
+        return json.dumps(o, separators=(",",":"), ensure_ascii=False)
+
+
+
+_TS_CACHE: tuple = (-1, "")  # (epoch second, formatted) — one tuple so threads never see a torn pair
+
+
+
 def _ts() -> str:
 
-    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00","Z")
+    global _TS_CACHE
+
+    t = int(time.time())
+
+    sec, txt = _TS_CACHE
+
+    if t != sec:
+
+        txt = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+
+        _TS_CACHE = (t, txt)
+
+    return txt
+
+
+
+# Numeric level per marker; lines below LOGX_LEVEL are dropped before any formatting.
+
+# Default 10 keeps every marker (no behavior change); e.g. LOGX_LEVEL=40 leaves only ERR.
+
+_LEVELS: Dict[str, int] = {"BOOT": 10, "CFG": 10, "RULE": 20, "HTTP": 30, "ERR": 40}
+
+_THRESHOLD = int(os.environ.get("LOGX_LEVEL", "10"))
+
+
+
+def enabled(marker: str) -> bool:
+
+    """True if `marker` lines would be emitted — guard expensive kwargs with it."""
+
+    return _LEVELS.get(marker, 40) >= _THRESHOLD
 
 
 
 def _emit(marker: str, msg: str, **kv: JSONValue) -> None:
 
+    if _LEVELS.get(marker, 40) < _THRESHOLD:
+
+        return
+
     line = f"{_ts()} [{marker}] {msg}"
 
     if kv:
 
         try:
 
-            line += " | " + json.dumps(kv, separators=(",",":"), ensure_ascii=False)
+            line += " | " + _dumps(kv)
 
         except Exception:
 
             line += " | " + str(kv)
 
-    print(line, flush=True)
+    _BUF.append(line)
+
+    if marker == "ERR":
+
+        _BUF.flush()
+
+
+
+class _LogBuffer:
+
+    """Collects log lines and writes them in one stdout write() per batch.
+
+    A daemon thread sleeps until a line is pending, then flushes `interval_s` later
+    or as soon as `max_lines` are pending."""
+
+    def __init__(self, interval_s: float = 0.05, max_lines: int = 64) -> None:
+
+        self.interval_s = interval_s
+
+        self.max_lines = max_lines
+
+        self._lines: List[str] = []
+
+        self._lock = threading.Lock()
+
+        self._write_lock = threading.Lock()  # keeps batches in order; append() never waits on it
+
+        self._wake = threading.Event()
+
+        self._thread: Optional[threading.Thread] = None
+
+
+
+    def append(self, line: str) -> None:
+
+        with self._lock:
+
+            self._lines.append(line)
+
+            n = len(self._lines)
+
+            wake = n == 1 or n >= self.max_lines  # first pending line starts the interval; full cuts it short
+
+            if self._thread is None:
+
+                self._thread = threading.Thread(target=self._run, name="logx-flush", daemon=True)
+
+                self._thread.start()
+
+        if wake:
+
+            self._wake.set()
+
+
+
+    def flush(self) -> None:
+
+        with self._write_lock:
+
+            with self._lock:
+
+                if not self._lines:
+
+                    return
+
+                batch, self._lines = self._lines, []
+
+            try:
+
+                sys.stdout.write("\n".join(batch) + "\n")
+
+                sys.stdout.flush()
+
+            except Exception:
+
+                pass  # stdout gone (shutdown / closed pipe) — drop, never raise from logging
+
+
+
+    def _run(self) -> None:
+
+        while True:
+
+            self._wake.wait()  # idle: no timeout, so no wakeups while nothing is pending
+
+            self._wake.clear()
+
+            # the full signal may already have been consumed by the clear above
+
+            if len(self._lines) < self.max_lines and self._wake.wait(self.interval_s):
+
+                self._wake.clear()
+
+            self.flush()
+
+
+
+_BUF = _LogBuffer()
+
+atexit.register(_BUF.flush)
+
+
+
+def flush() -> None:
+
+    _BUF.flush()
 
 
 
@@ -122,7 +279,9 @@ def http_get(url: str, *, requests_mod: _RequestsLike, timeout: float = 10.0, ma
 
             ms = int((time.perf_counter() - t0) * 1000)
 
-            http("GET", url=url, status=int(getattr(r,"status_code",-1)), ms=ms, retries=retries)
+            if enabled("HTTP"):
+
+                http("GET", url=url, status=int(getattr(r,"status_code",-1)), ms=ms, retries=retries)
 
             r.raise_for_status()
 
@@ -140,9 +299,11 @@ def http_get(url: str, *, requests_mod: _RequestsLike, timeout: float = 10.0, ma
 
             ms = int((time.perf_counter() - t0) * 1000)
 
-            status = int(getattr(getattr(e,"response",None),"status_code",-1)) if hasattr(e,"response") else -1
+            if enabled("HTTP"):
 
-            http("GET_FAIL", url=url, status=status, ms=ms, retries=retries)
+                status = int(getattr(getattr(e,"response",None),"status_code",-1)) if hasattr(e,"response") else -1
+
+                http("GET_FAIL", url=url, status=status, ms=ms, retries=retries)
 
             if retries >= max_retries:
 
@@ -166,11 +327,15 @@ def guarded(fn_name: str):
 
             except Exception as e:  # intentional broad catch at top-level loop
 
-                tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+                if enabled("ERR"):
+
+                    # negative limit: walk only the innermost frames — the tail is all we keep
+
+                    tb = "".join(traceback.TracebackException(type(e), e, e.__traceback__, limit=-8).format())
 
-                snippet = tb[-800:] if len(tb) > 800 else tb
+                    snippet = tb[-800:] if len(tb) > 800 else tb
 
-                err(f"{fn_name} crash", exc=str(e), traceback=snippet)
+                    err(f"{fn_name} crash", exc=str(e), traceback=snippet)
 
                 return None
 
@@ -35,7 +35,7 @@ import time
 from typing import List, Optional
 
 import outcome_tracker
-from utils import log, load_config, cfg, tg_ping
+from utils import log, load_config, cfg, tg_ping, get_http_session, start_config_watch
 from universe_filter import UniverseFilter
 from coverage_universe_builder import CoverageUniverseBuilder
 from benthos_runtime import BenthosRuntime
@@ -92,8 +92,6 @@ def fetch_usdt_symbols() -> List[str]:
     Resuelve la lista de símbolos USDT desde config o Binance REST.
     Fallback a lista mínima si todo falla — nunca devuelve lista vacía.
     """
-    import requests
-
     mode = cfg("symbols.mode", "auto")
 
     if mode == "static":
@@ -116,7 +114,7 @@ def fetch_usdt_symbols() -> List[str]:
 
     # Auto: fetch desde Binance
     try:
-        r = requests.get(
+        r = get_http_session().get(
             "https://api.binance.com/api/v3/exchangeInfo",
             timeout=10,
         )
@@ -266,7 +264,7 @@ def run() -> None:
 
     Flujo:
     1. Registrar signal handlers
-    2. Cargar config
+    2. Cargar config (+ watcher de config.yaml)
     3. Resolver símbolos
     4. Arrancar UniverseFilter
     5. Arrancar outcome_tracker
@@ -281,6 +279,7 @@ def run() -> None:
 
     log("BOOT", f"KTS TradeSeeker {BOT_VER} starting")
     load_config(force=True)
+    start_config_watch()
 
     syms = fetch_usdt_symbols()
     if not syms:
@@ -25,13 +25,27 @@ Reglas disponibles (todas apagadas por defecto):
 
 import time
 import json
-import statistics as stats
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+
+from utils import log, load_config, cfg, config_generation, tg_send, on_cooldown, mark_cooldown
+from kline_stream import KlineStream
+
+try:
+    import orjson
+
+    def _dumps(o: Any) -> str:
+        return orjson.dumps(o).decode()
+except ImportError:  # orjson es opcional — mismo JSON compacto vía stdlib
+    def _dumps(o: Any) -> str:
+        return json.dumps(o, separators=(",", ":"))
 
-from utils import log, load_config, cfg, tg_send, on_cooldown, mark_cooldown
 
 # ---------------------------------------------------------------------------
 # Binance REST
@@ -39,6 +53,30 @@ from utils import log, load_config, cfg, tg_send, on_cooldown, mark_cooldown
 
 BINANCE_REST = "https://api.binance.com"
 
+_klines_session: Optional[requests.Session] = None
+_klines_pool_size = 0
+_klines_lock = threading.Lock()
+
+
+def _get_klines_session(pool_size: int) -> requests.Session:
+    """
+    Session keep-alive dedicada a klines, con pool >= workers del poll.
+    Sin esto cada worker abre TCP+TLS nuevo por request, y con un pool
+    menor que los workers urllib3 descarta conexiones al devolverlas.
+    Se reconstruye solo si cambia scanner.parallel_workers.
+    """
+    global _klines_session, _klines_pool_size
+    with _klines_lock:
+        if _klines_session is None or _klines_pool_size != pool_size:
+            if _klines_session is not None:
+                _klines_session.close()
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            _klines_session   = session
+            _klines_pool_size = pool_size
+        return _klines_session
+
 
 def get_klines(symbol: str, interval: str, limit: int = 200) -> List:
     """
@@ -46,7 +84,7 @@ def get_klines(symbol: str, interval: str, limit: int = 200) -> List:
     Returns list of OHLCV arrays. Raises on HTTP error.
     """
     url = BINANCE_REST + "/api/v3/klines"
-    r = requests.get(
+    r = _get_klines_session(_klines_pool_size or 16).get(
         url,
         params={"symbol": symbol, "interval": interval, "limit": limit},
         timeout=10,
@@ -55,26 +93,90 @@ def get_klines(symbol: str, interval: str, limit: int = 200) -> List:
     return r.json()
 
 
+# ---------------------------------------------------------------------------
+# Kline source — WS buffers (scanner.kline_stream) with REST warmup/fallback
+# ---------------------------------------------------------------------------
+
+_kline_stream: Optional[KlineStream] = None
+_kline_stream_key: Optional[Tuple] = None
+
+
+def _sync_kline_stream(symbols: List[str], timeframes: List[str], depth: int) -> None:
+    """
+    Start/stop/rebuild the WS kline stream to match config and the symbol set.
+    Called once per poll from poll_once (single thread).
+    """
+    global _kline_stream, _kline_stream_key
+    enabled = cfg("scanner.kline_stream", False) and symbols and timeframes
+    want = (tuple(symbols), tuple(timeframes), depth) if enabled else None
+    if want == _kline_stream_key:
+        return
+    if _kline_stream is not None:
+        _kline_stream.stop()
+        _kline_stream = None
+    if want is not None:
+        _kline_stream = KlineStream(symbols, timeframes, depth, log_fn=log)
+        _kline_stream.start()
+    _kline_stream_key = want
+
+
+def fetch_klines(symbol: str, interval: str, limit: int) -> List:
+    """
+    Klines from the WS buffer when warm; otherwise REST, seeding the buffer.
+    """
+    stream = _kline_stream
+    if stream is not None:
+        k = stream.klines(symbol, interval, limit)
+        if k is not None:
+            return k
+    k = get_klines(symbol, interval, limit=limit)
+    if stream is not None:
+        stream.seed(symbol, interval, k)
+    return k
+
+
 # ---------------------------------------------------------------------------
 # Math helpers
 # ---------------------------------------------------------------------------
 
-def ema(values: List[float], length: int) -> List[float]:
-    """Exponential moving average. Returns same-length list."""
-    if not values or length <= 1:
-        return values or []
-    k = 2 / (length + 1)
-    out = [values[0]]
-    for v in values[1:]:
-        out.append(out[-1] + k * (v - out[-1]))
+def _ema_loop(vals: np.ndarray, k: float) -> np.ndarray:
+    out = np.empty_like(vals)
+    out[0] = vals[0]
+    for i in range(1, vals.shape[0]):
+        out[i] = out[i - 1] + k * (vals[i] - out[i - 1])
     return out
 
 
-def median(x: List[float], default: float = 0.0) -> float:
+try:
+    from scipy.signal import lfilter as _lfilter
+except ImportError:  # scipy opcional — numba o loop puro como fallback
+    _lfilter = None
     try:
-        return stats.median(x)
-    except Exception:
+        from numba import njit
+        _ema_loop = njit(cache=True)(_ema_loop)
+    except ImportError:
+        pass
+
+
+def ema(values: Sequence[float], length: int) -> np.ndarray:
+    """
+    Exponential moving average. Returns same-length float64 array.
+    y[n] = k*x[n] + (1-k)*y[n-1], y[0] = x[0] — un solo filtro IIR en C.
+    """
+    vals = np.asarray(values, dtype=np.float64)
+    if vals.size == 0 or length <= 1:
+        return vals
+    k = 2 / (length + 1)
+    if _lfilter is None:
+        return _ema_loop(vals, k)
+    out, _ = _lfilter([k], [1.0, -(1.0 - k)], vals, zi=[vals[0] * (1.0 - k)])
+    return out
+
+
+def median(x: Sequence[float], default: float = 0.0) -> float:
+    if len(x) == 0:
         return default
+    return float(np.median(x))
 
 
 def notional(o: float, h: float, l: float, c: float, v: float) -> float:
@@ -84,6 +186,10 @@ def notional(o: float, h: float, l: float, c: float, v: float) -> float:
 
 # ---------------------------------------------------------------------------
 # Rule functions
+#
+# Las reglas multi-barra reciben `arr`: ndarray float64 (n_bars, 5) con
+# columnas open/high/low/close/volume, en orden Fortran: cada columna es
+# un buffer contiguo y sus slices son views (reducciones .max()/.min() SIMD).
 # ---------------------------------------------------------------------------
 
 def rule_pump(
@@ -94,7 +200,7 @@ def rule_pump(
     o, h, l, c, v = bar
     pct    = (c - o) / o * 100.0 if o else 0.0
     vol_ok = v >= (tf_adj["vol_mult"] * (v_med or 1))
-    return (pct >= tf_adj["delta_pct"] and vol_ok), {"delta_pct": round(pct, 3)}
+    return (pct >= tf_adj["delta_pct"] and vol_ok), {"delta_pct": pct}
 
 
 def rule_dump(
@@ -105,70 +211,77 @@ def rule_dump(
     o, h, l, c, v = bar
     pct    = (c - o) / o * 100.0 if o else 0.0
     vol_ok = v >= (tf_adj["vol_mult"] * (v_med or 1))
-    return (pct <= tf_adj["delta_pct"] and vol_ok), {"delta_pct": round(pct, 3)}
+    return (pct <= tf_adj["delta_pct"] and vol_ok), {"delta_pct": pct}
 
 
 def rule_breakout_up(
-    ohlcv: List[Tuple],
+    arr: np.ndarray,
     tf_adj: Dict,
-    ema_len: int,
+    e: np.ndarray,
+    v_med: float,
 ) -> Tuple[bool, Dict]:
-    closes = [b[3] for b in ohlcv]
-    highs  = [b[1] for b in ohlcv]
-    vols   = [b[4] for b in ohlcv]
-    rng_hi = max(highs[-tf_adj["range_lookback"] - 1:-1])
+    closes = arr[:, 3]
+    highs  = arr[:, 1]
+    vols   = arr[:, 4]
+    rng_hi = highs[-tf_adj["range_lookback"] - 1:-1].max()
     buf    = rng_hi * (1 + tf_adj["buffer_pct"] / 100.0)
-    e      = ema(closes, ema_len)
     cond   = closes[-1] > buf
     if tf_adj.get("ema_confirm", True):
         cond = cond and closes[-1] > e[-1]
-    vol_med = median(vols[-20:], 0.0)
-    vol_ok  = vols[-1] >= (tf_adj["vol_mult"] * (vol_med or 1))
-    return (cond and vol_ok), {"range_hi": round(rng_hi, 4), "ema": round(e[-1], 4)}
+    vol_ok  = vols[-1] >= (tf_adj["vol_mult"] * (v_med or 1))
+    return (cond and vol_ok), {"range_hi": rng_hi, "ema": e[-1]}
 
 
 def rule_breakdown_dn(
-    ohlcv: List[Tuple],
+    arr: np.ndarray,
     tf_adj: Dict,
-    ema_len: int,
+    e: np.ndarray,
+    v_med: float,
 ) -> Tuple[bool, Dict]:
-    closes = [b[3] for b in ohlcv]
-    lows   = [b[2] for b in ohlcv]
-    vols   = [b[4] for b in ohlcv]
-    rng_lo = min(lows[-tf_adj["range_lookback"] - 1:-1])
+    closes = arr[:, 3]
+    lows   = arr[:, 2]
+    vols   = arr[:, 4]
+    rng_lo = lows[-tf_adj["range_lookback"] - 1:-1].min()
     buf    = rng_lo * (1 - tf_adj["buffer_pct"] / 100.0)
-    e      = ema(closes, ema_len)
     cond   = closes[-1] < buf
     if tf_adj.get("ema_confirm", True):
         cond = cond and closes[-1] < e[-1]
-    vol_med = median(vols[-20:], 0.0)
-    vol_ok  = vols[-1] >= (tf_adj["vol_mult"] * (vol_med or 1))
-    return (cond and vol_ok), {"range_lo": round(rng_lo, 4), "ema": round(e[-1], 4)}
+    vol_ok  = vols[-1] >= (tf_adj["vol_mult"] * (v_med or 1))
+    return (cond and vol_ok), {"range_lo": rng_lo, "ema": e[-1]}
+
+
+# Fila por símbolo que scan_symbol entrega para el cruce EMA — poll_once
+# apila las de cada tf en una matriz (n_symbols, 8) y la evalúa de una vez.
+# Columnas: ef_prev, ef_cur, es_prev, es_cur, volume, v_med, notional, close
+_CrossRow = Tuple[float, float, float, float, float, float, float, float]
+
+
+def cross_row(arr: np.ndarray, ef: np.ndarray, es: np.ndarray, v_med: float, bar_not: float) -> _CrossRow:
+    return (
+        float(ef[-2]), float(ef[-1]), float(es[-2]), float(es[-1]),
+        float(arr[-1, 4]), v_med, bar_not, float(arr[-1, 3]),
+    )
 
 
 def rule_ema_cross(
-    ohlcv: List[Tuple],
-    fast_len: int,
-    slow_len: int,
+    cross: np.ndarray,
     direction: str,
     tf_adj: Dict,
-) -> Tuple[bool, Dict]:
-    closes = [b[3] for b in ohlcv]
-    vols   = [b[4] for b in ohlcv]
-    ef     = ema(closes, fast_len)
-    es     = ema(closes, slow_len)
-    if len(ef) < 2 or len(es) < 2:
-        return False, {}
+) -> np.ndarray:
+    """
+    Cruce EMA fast/slow de todos los símbolos de un tf en una sola pasada.
+    cross: (n_symbols, 8) con las columnas de _CrossRow.
+    Devuelve la máscara de símbolos que cruzaron con volumen y notional OK.
+    """
+    ef_prev, ef_cur = cross[:, 0], cross[:, 1]
+    es_prev, es_cur = cross[:, 2], cross[:, 3]
+    vols, v_med, bar_not = cross[:, 4], cross[:, 5], cross[:, 6]
     if direction == "up":
-        crossed = ef[-2] <= es[-2] and ef[-1] > es[-1]
+        crossed = (ef_prev <= es_prev) & (ef_cur > es_cur)
     else:
-        crossed = ef[-2] >= es[-2] and ef[-1] < es[-1]
-    vol_med = median(vols[-20:], 0.0)
-    vol_ok  = vols[-1] >= (tf_adj["vol_mult"] * (vol_med or 1))
-    return (crossed and vol_ok), {
-        "ema_fast": round(ef[-1], 4),
-        "ema_slow": round(es[-1], 4),
-    }
+        crossed = (ef_prev >= es_prev) & (ef_cur < es_cur)
+    vol_ok = vols >= tf_adj["vol_mult"] * np.where(v_med != 0, v_med, 1.0)
+    return crossed & vol_ok & (bar_not >= tf_adj.get("min_notional", 0))
 
 
 def rule_pump_early(
@@ -180,29 +293,28 @@ def rule_pump_early(
     pct      = (c - o) / o * 100.0 if o else 0.0
     vol_ok   = v >= (early_cfg["vol_mult"] * (v_med or 1))
     triggered = pct >= early_cfg["delta_pct"] and vol_ok
-    return triggered, {"delta_pct": round(pct, 3), "early": True}
+    return triggered, {"delta_pct": pct, "early": True}
 
 
 def rule_breakout_up_early(
-    ohlcv: List[Tuple],
+    arr: np.ndarray,
     early_cfg: Dict,
-    ema_len: int,
+    e: np.ndarray,
+    v_med: float,
 ) -> Tuple[bool, Dict]:
-    closes   = [b[3] for b in ohlcv]
-    highs    = [b[1] for b in ohlcv]
-    vols     = [b[4] for b in ohlcv]
+    closes   = arr[:, 3]
+    highs    = arr[:, 1]
+    vols     = arr[:, 4]
     lookback = early_cfg.get("range_lookback", 32)
-    rng_hi   = max(highs[-lookback - 1:-1])
+    rng_hi   = highs[-lookback - 1:-1].max()
     buf      = rng_hi * (1 + early_cfg.get("buffer_pct", 0.20) / 100.0)
-    e        = ema(closes, ema_len)
     cond     = closes[-1] > buf
     if early_cfg.get("ema_confirm", True):
         cond = cond and closes[-1] > e[-1]
-    vol_med = median(vols[-20:], 0.0)
-    vol_ok  = vols[-1] >= (early_cfg["vol_mult"] * (vol_med or 1))
+    vol_ok  = vols[-1] >= (early_cfg["vol_mult"] * (v_med or 1))
     return (cond and vol_ok), {
-        "range_hi": round(rng_hi, 4),
-        "ema":      round(e[-1], 4),
+        "range_hi": rng_hi,
+        "ema":      e[-1],
         "early":    True,
     }
 
@@ -211,6 +323,11 @@ def rule_breakout_up_early(
 # Alert formatter
 # ---------------------------------------------------------------------------
 
+# Decimales por clave en el JSON del alert (default 4). Las reglas devuelven
+# valores crudos (float o escalares numpy); se redondea solo al formatear.
+_EXTRA_DECIMALS = {"delta_pct": 3}
+
+
 def format_alert(
     sym: str,
     tf: str,
@@ -219,115 +336,278 @@ def format_alert(
     price: float,
 ) -> str:
     pre = cfg("telegram.prefix", "TS")
+    shown = {
+        k: round(float(v), _EXTRA_DECIMALS.get(k, 4))
+        if isinstance(v, (float, np.floating)) else v
+        for k, v in extras.items()
+    }
     return (
         f"[{pre}] {rule_name} | {sym} {tf} @ {price:.6g} | "
-        f"{json.dumps(extras, separators=(',', ':'))}"
+        f"{_dumps(shown)}"
     )
 
 
 # ---------------------------------------------------------------------------
-# Per-symbol scan
+# Per-timeframe rule settings
 # ---------------------------------------------------------------------------
 
-def scan_symbol(
-    sym: str,
-    tf: str,
+# rule config key → timeframe override key
+_RULE_ADJUST_KEYS = {
+    "pump_spike":     "pump_adjust",
+    "dump_spike":     "dump_adjust",
+    "breakout_up":    "bo_up_adjust",
+    "breakdown_down": "bo_dn_adjust",
+    "ema_cross":      "cross_adjust",
+}
+
+
+def merge_rule_adj(base: Dict[str, Dict], adj: Dict) -> Dict[str, Dict]:
+    """
+    Merge global rules.<name> settings with the timeframe's <x>_adjust overrides.
+    Depends only on tf — computed once per tf per config load, not per symbol.
+    """
+    return {
+        name: {**base.get(name, {}), **(adj.get(adj_key, {}) or {})}
+        for name, adj_key in _RULE_ADJUST_KEYS.items()
+    }
+
+
+# ---------------------------------------------------------------------------
+# Scan plan — config specialized into per-tf check lists, rebuilt on reload
+# ---------------------------------------------------------------------------
+
+class _Bar:
+    """Per-(symbol, tf) evaluation context shared by every check."""
+
+    __slots__ = ("arr", "last", "close", "v_med", "bar_not", "_emas")
+
+    def __init__(self, arr: np.ndarray) -> None:
+        self.arr     = arr
+        self.last    = tuple(arr[-1].tolist())
+        o, h, l, c, v = self.last
+        self.close   = c
+        self.v_med   = median(arr[-20:, 4], 0.0)   # shared by every volume check
+        self.bar_not = notional(o, h, l, c, v)
+        self._emas: Dict[int, np.ndarray] = {}
+
+    def ema(self, length: int) -> np.ndarray:
+        # EMAs compartidas entre reglas — una pasada por longitud distinta,
+        # calculada solo si alguna regla activa la pide
+        e = self._emas.get(length)
+        if e is None:
+            e = self._emas[length] = ema(self.arr[:, 3], length)
+        return e
+
+
+# (alert name, cooldown key, cooldown min, min notional, evaluate(bar) → (ok, extras))
+_Check = Tuple[str, str, int, float, Callable[[_Bar], Tuple[bool, Dict]]]
+
+# (direction, alert name, cooldown key, cooldown min, ema_cross settings) —
+# evaluated over all symbols of the tf at once by scan_crosses
+_Cross = Tuple[str, str, str, int, Dict]
+
+_EARLY_DEFAULTS = {
+    "delta_pct":      2.5,
+    "vol_mult":       1.8,
+    "min_notional":   50_000,
+    "cooldown_min":   10,
+    "range_lookback": 32,
+    "buffer_pct":     0.20,
+    "ema_confirm":    True,
+}
+
+
+@dataclass
+class _ScanPlan:
+    generation: int
+    lookback:   int
+    limit:      int                          # klines per fetch
+    workers:    int
+    checks:     Dict[str, List[_Check]]      # tf → enabled checks, alert order
+    crosses:    Dict[str, List[_Cross]]      # tf → enabled EMA-cross directions
+    cross_emas: Tuple[int, int]              # (fast, slow) EMA lengths
+    late_pct:   Dict[str, Optional[float]]   # tf → late_filter_pct
+
+
+def _tf_checks(
     adj: Dict,
+    rule_adj: Dict[str, Dict],
     rules_on: Dict,
     ema_len: int,
-    ema_fast: int,
-    ema_slow: int,
-    lookback: int,
     cooldown: int,
     early_cfg: Dict,
-) -> List[Tuple[str, str, str]]:
+) -> List[_Check]:
+    """
+    Enabled per-symbol checks for one timeframe. Disabled rules are left out
+    of the list entirely, so scan_symbol never tests rules.enable per symbol.
+    EMA crosses are batched separately — see _tf_crosses.
+    """
+    def on(key: str) -> bool:
+        return bool(rules_on.get(key, True))
+
+    pump_adj  = rule_adj["pump_spike"]
+    dump_adj  = rule_adj["dump_spike"]
+    bo_up_adj = rule_adj["breakout_up"]
+    bo_dn_adj = rule_adj["breakdown_down"]
+    early_on  = adj.get("early_enabled", True)
+    early_cd  = early_cfg.get("cooldown_min", 10)
+    early_min = early_cfg.get("min_notional", 50_000)
+
+    checks: List[_Check] = []
+    if on("pump_spike"):
+        checks.append(("PUMP", "pump", cooldown, pump_adj.get("min_notional", 0),
+                       lambda b: rule_pump(b.last, pump_adj, b.v_med)))
+    if on("dump_spike"):
+        checks.append(("DUMP", "dump", cooldown, dump_adj.get("min_notional", 0),
+                       lambda b: rule_dump(b.last, dump_adj, b.v_med)))
+    if on("breakout_up"):
+        checks.append(("BREAKOUT_UP", "bo_up", cooldown, bo_up_adj.get("min_notional", 0),
+                       lambda b: rule_breakout_up(b.arr, bo_up_adj, b.ema(ema_len), b.v_med)))
+    if on("breakdown_down"):
+        checks.append(("BREAKDOWN_DN", "bo_dn", cooldown, bo_dn_adj.get("min_notional", 0),
+                       lambda b: rule_breakdown_dn(b.arr, bo_dn_adj, b.ema(ema_len), b.v_med)))
+    if early_on and on("pump_early"):
+        checks.append(("PUMP_EARLY", "pump_early", early_cd, early_min,
+                       lambda b: rule_pump_early(b.last, early_cfg, b.v_med)))
+    if early_on and on("breakout_up_early"):
+        checks.append(("BREAKOUT_UP_EARLY", "bo_up_early", early_cd, early_min,
+                       lambda b: rule_breakout_up_early(b.arr, early_cfg, b.ema(ema_len), b.v_med)))
+    return checks
+
+
+def _tf_crosses(cross_adj: Dict, rules_on: Dict, cooldown: int) -> List[_Cross]:
+    """Enabled EMA-cross directions for one timeframe, in alert order."""
+    crosses: List[_Cross] = []
+    if rules_on.get("ema_cross_up", True):
+        crosses.append(("up", "EMA_CROSS_UP", "cross_up", cooldown, cross_adj))
+    if rules_on.get("ema_cross_down", True):
+        crosses.append(("down", "EMA_CROSS_DN", "cross_dn", cooldown, cross_adj))
+    return crosses
+
+
+def _build_plan(generation: int) -> _ScanPlan:
+    rules_on  = cfg("rules.enable", {}) or {}
+    ema_len   = int(cfg("rules.ema_len",       20))
+    ema_fast  = int(cfg("rules.ema_fast_len",   9))
+    ema_slow  = int(cfg("rules.ema_slow_len",  20))
+    lookback  = int(cfg("rules.lookback_bars", 32))
+    cooldown  = int(cfg("rules.cooldown_min",  20))
+
+    early_cfg  = {**_EARLY_DEFAULTS, **(cfg("rules.early", {}) or {})}
+    timeframes = cfg("timeframes", {}) or {}
+    rule_base  = {name: cfg(f"rules.{name}", {}) or {} for name in _RULE_ADJUST_KEYS}
+
+    checks:   Dict[str, List[_Check]]    = {}
+    crosses:  Dict[str, List[_Cross]]    = {}
+    late_pct: Dict[str, Optional[float]] = {}
+    for tf, adj in timeframes.items():
+        adj = adj or {}
+        rule_adj = merge_rule_adj(rule_base, adj)
+        checks[tf]   = _tf_checks(adj, rule_adj, rules_on, ema_len, cooldown, early_cfg)
+        crosses[tf]  = _tf_crosses(rule_adj["ema_cross"], rules_on, cooldown)
+        late_pct[tf] = adj.get("late_filter_pct")
+
+    return _ScanPlan(
+        generation = generation,
+        lookback   = lookback,
+        limit      = max(lookback + 50, 120),
+        workers    = max(int(cfg("scanner.parallel_workers", 25)), 1),
+        checks     = checks,
+        crosses    = crosses,
+        cross_emas = (ema_fast, ema_slow),
+        late_pct   = late_pct,
+    )
+
+
+_plan: Optional[_ScanPlan] = None
+
+
+def _current_plan() -> _ScanPlan:
+    """Plan for the loaded config — rebuilt only when utils reports a reload."""
+    global _plan
+    gen = config_generation()
+    if _plan is None or _plan.generation != gen:
+        _plan = _build_plan(gen)
+    return _plan
+
+
+# ---------------------------------------------------------------------------
+# Per-symbol scan
+# ---------------------------------------------------------------------------
+
+def scan_symbol(
+    sym: str,
+    tf: str,
+    plan: _ScanPlan,
+) -> Tuple[List[Tuple[str, str, str]], Optional[_CrossRow]]:
     """
-    Scan a single symbol on a single timeframe.
-    Returns list of (alert_str, cooldown_key, symbol) tuples.
+    Scan a single symbol on a single timeframe, running plan.checks[tf].
+    Returns (alerts, cross): alerts is a list of (alert_str, cooldown_key, symbol)
+    tuples; cross is the symbol's EMA-cross row for poll_once's batch, or None.
     Isolated in its own try/except — one bad symbol never stops the scan.
     """
     alerts: List[Tuple[str, str, str]] = []
+    cross: Optional[_CrossRow] = None
     try:
-        k     = get_klines(sym, tf, limit=max(lookback + 50, 120))
-        ohlcv = [
-            (float(x[1]), float(x[2]), float(x[3]), float(x[4]), float(x[5]))
-            for x in k
-        ]
-        if len(ohlcv) < lookback + 5:
-            return []
-
-        last  = ohlcv[-1]
-        o, h, l, c, v = last
-        v_med    = median([b[4] for b in ohlcv[-20:]], 0.0)
-        bar_not  = notional(o, h, l, c, v)
+        k = fetch_klines(sym, tf, plan.limit)
+        if len(k) < plan.lookback + 5:
+            return [], None
+        # kline: [openTime, open, high, low, close, volume, closeTime, ...]
+        # numpy parses the decimal strings straight to float64 in C;
+        # order="F" makes each column (highs, closes, ...) a contiguous buffer
+        arr = np.array([row[1:6] for row in k], dtype=np.float64, order="F")
 
         # Late-entry filter
-        late_pct = adj.get("late_filter_pct")
+        late_pct = plan.late_pct[tf]
         if late_pct is not None:
+            o, c = arr[-1, 0], arr[-1, 3]
             bar_move = abs((c - o) / o * 100.0) if o else 0.0
             if bar_move >= late_pct:
-                return []
-
-        # Build per-rule adj dicts
-        pump_adj  = {**(cfg("rules.pump_spike",     {}) or {}), **(adj.get("pump_adjust",    {}) or {})}
-        dump_adj  = {**(cfg("rules.dump_spike",     {}) or {}), **(adj.get("dump_adjust",    {}) or {})}
-        bo_up_adj = {**(cfg("rules.breakout_up",    {}) or {}), **(adj.get("bo_up_adjust",   {}) or {})}
-        bo_dn_adj = {**(cfg("rules.breakdown_down", {}) or {}), **(adj.get("bo_dn_adjust",   {}) or {})}
-        cross_adj = {**(cfg("rules.ema_cross",      {}) or {}), **(adj.get("cross_adjust",   {}) or {})}
-
-        # PUMP
-        if rules_on.get("pump_spike", True) and not on_cooldown(sym, "pump", cooldown):
-            ok, extras = rule_pump(last, pump_adj, v_med)
-            if ok and bar_not >= pump_adj.get("min_notional", 0):
-                alerts.append((format_alert(sym, tf, "PUMP", extras, c), "pump", sym))
-
-        # DUMP
-        if rules_on.get("dump_spike", True) and not on_cooldown(sym, "dump", cooldown):
-            ok, extras = rule_dump(last, dump_adj, v_med)
-            if ok and bar_not >= dump_adj.get("min_notional", 0):
-                alerts.append((format_alert(sym, tf, "DUMP", extras, c), "dump", sym))
-
-        # BREAKOUT_UP
-        if rules_on.get("breakout_up", True) and not on_cooldown(sym, "bo_up", cooldown):
-            ok, extras = rule_breakout_up(ohlcv, bo_up_adj, ema_len)
-            if ok and bar_not >= bo_up_adj.get("min_notional", 0):
-                alerts.append((format_alert(sym, tf, "BREAKOUT_UP", extras, c), "bo_up", sym))
-
-        # BREAKDOWN_DN
-        if rules_on.get("breakdown_down", True) and not on_cooldown(sym, "bo_dn", cooldown):
-            ok, extras = rule_breakdown_dn(ohlcv, bo_dn_adj, ema_len)
-            if ok and bar_not >= bo_dn_adj.get("min_notional", 0):
-                alerts.append((format_alert(sym, tf, "BREAKDOWN_DN", extras, c), "bo_dn", sym))
-
-        # EMA_CROSS_UP
-        if rules_on.get("ema_cross_up", True) and not on_cooldown(sym, "cross_up", cooldown):
-            ok, extras = rule_ema_cross(ohlcv, ema_fast, ema_slow, "up", cross_adj)
-            if ok and bar_not >= cross_adj.get("min_notional", 0):
-                alerts.append((format_alert(sym, tf, "EMA_CROSS_UP", extras, c), "cross_up", sym))
-
-        # EMA_CROSS_DN
-        if rules_on.get("ema_cross_down", True) and not on_cooldown(sym, "cross_dn", cooldown):
-            ok, extras = rule_ema_cross(ohlcv, ema_fast, ema_slow, "down", cross_adj)
-            if ok and bar_not >= cross_adj.get("min_notional", 0):
-                alerts.append((format_alert(sym, tf, "EMA_CROSS_DN", extras, c), "cross_dn", sym))
-
-        # PUMP_EARLY / BREAKOUT_UP_EARLY
-        early_enabled = adj.get("early_enabled", True)
-        early_cd      = early_cfg.get("cooldown_min", 10)
-
-        if early_enabled and rules_on.get("pump_early", True) and not on_cooldown(sym, "pump_early", early_cd):
-            ok, extras = rule_pump_early(last, early_cfg, v_med)
-            if ok and bar_not >= early_cfg.get("min_notional", 50_000):
-                alerts.append((format_alert(sym, tf, "PUMP_EARLY", extras, c), "pump_early", sym))
-
-        if early_enabled and rules_on.get("breakout_up_early", True) and not on_cooldown(sym, "bo_up_early", early_cd):
-            ok, extras = rule_breakout_up_early(ohlcv, early_cfg, ema_len)
-            if ok and bar_not >= early_cfg.get("min_notional", 50_000):
-                alerts.append((format_alert(sym, tf, "BREAKOUT_UP_EARLY", extras, c), "bo_up_early", sym))
+                return [], None
+
+        bar = _Bar(arr)
+        for name, cd_key, cd_min, min_not, evaluate in plan.checks[tf]:
+            if on_cooldown(sym, cd_key, cd_min):
+                continue
+            ok, extras = evaluate(bar)
+            if ok and bar.bar_not >= min_not:
+                alerts.append((format_alert(sym, tf, name, extras, bar.close), cd_key, sym))
+
+        # EMA_CROSS_UP / EMA_CROSS_DN — evaluados en lote por poll_once
+        if plan.crosses[tf]:
+            ema_fast, ema_slow = plan.cross_emas
+            cross = cross_row(arr, bar.ema(ema_fast), bar.ema(ema_slow), bar.v_med, bar.bar_not)
 
     except Exception as e:
         log("ERR", f"scan_symbol [{sym} {tf}]: {type(e).__name__}: {e}")
 
+    return alerts, cross
+
+
+# ---------------------------------------------------------------------------
+# EMA cross — batched over all symbols of a tf after the fetch phase
+# ---------------------------------------------------------------------------
+
+def scan_crosses(
+    tf: str,
+    syms: List[str],
+    rows: List[_CrossRow],
+    crosses: List[_Cross],
+) -> List[Tuple[str, str, str]]:
+    """
+    EMA_CROSS_UP / EMA_CROSS_DN for every symbol scanned on `tf`.
+    One vector op per direction over the stacked rows; the Python loop
+    only visits symbols that crossed. Same return shape as scan_symbol alerts.
+    """
+    alerts: List[Tuple[str, str, str]] = []
+    cross = np.array(rows, dtype=np.float64, order="F")
+    for direction, name, cd_key, cd_min, cross_adj in crosses:
+        for i in np.nonzero(rule_ema_cross(cross, direction, cross_adj))[0]:
+            sym = syms[i]
+            if on_cooldown(sym, cd_key, cd_min):
+                continue
+            extras = {"ema_fast": cross[i, 1], "ema_slow": cross[i, 3]}
+            alerts.append((format_alert(sym, tf, name, extras, float(cross[i, 7])), cd_key, sym))
     return alerts
 
 
@@ -341,59 +621,50 @@ def poll_once(symbols: List[str]) -> None:
     Disabled in production — called only if explicitly enabled in main.py.
 
     Uses ThreadPoolExecutor for parallel REST calls.
+    Timeframes with no enabled rule are skipped without fetching.
+    EMA crosses are evaluated per tf in one batch once all fetches are done.
     Alerts are sent after all futures complete to avoid partial-cycle Telegram spam.
     """
     load_config()
+    plan = _current_plan()
 
-    rules_on  = cfg("rules.enable", {}) or {}
-    ema_len   = int(cfg("rules.ema_len",       20))
-    ema_fast  = int(cfg("rules.ema_fast_len",   9))
-    ema_slow  = int(cfg("rules.ema_slow_len",  20))
-    lookback  = int(cfg("rules.lookback_bars", 32))
-    cooldown  = int(cfg("rules.cooldown_min",  20))
-    throttle  = max(0.0, float(cfg("telegram.throttle_sec", 2.0)))
-    workers   = int(cfg("scanner.parallel_workers", 25))
-
-    early_defaults = {
-        "delta_pct":      2.5,
-        "vol_mult":       1.8,
-        "min_notional":   50_000,
-        "cooldown_min":   10,
-        "range_lookback": 32,
-        "buffer_pct":     0.20,
-        "ema_confirm":    True,
-    }
-    early_cfg  = {**early_defaults, **(cfg("rules.early", {}) or {})}
-    timeframes = cfg("timeframes", {}) or {}
+    active_tfs = [tf for tf, checks in plan.checks.items() if checks or plan.crosses[tf]]
+
+    _get_klines_session(plan.workers)
+    _sync_kline_stream(symbols, active_tfs, plan.limit)
 
-    tasks = [
-        (sym, tf, adj)
-        for tf, adj in timeframes.items()
-        for sym in symbols
-    ]
+    tasks = [(sym, tf) for tf in active_tfs for sym in symbols]
 
     pending_alerts: List[Tuple[str, str, str]] = []
+    cross_syms: Dict[str, List[str]]       = {tf: [] for tf in active_tfs}
+    cross_rows: Dict[str, List[_CrossRow]] = {tf: [] for tf in active_tfs}
     t0 = time.monotonic()
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
+    with ThreadPoolExecutor(max_workers=plan.workers) as executor:
         futures = {
-            executor.submit(
-                scan_symbol,
-                sym, tf, adj,
-                rules_on, ema_len, ema_fast, ema_slow,
-                lookback, cooldown, early_cfg,
-            ): (sym, tf)
-            for sym, tf, adj in tasks
+            executor.submit(scan_symbol, sym, tf, plan): (sym, tf)
+            for sym, tf in tasks
         }
         for future in as_completed(futures):
             sym, tf = futures[future]
             try:
-                result = future.result()
-                if result:
-                    pending_alerts.extend(result)
+                alerts, cross = future.result()
+                if alerts:
+                    pending_alerts.extend(alerts)
+                if cross is not None:
+                    cross_syms[tf].append(sym)
+                    cross_rows[tf].append(cross)
             except Exception as e:
                 log("ERR", f"scanner future [{sym} {tf}]: {type(e).__name__}: {e}")
 
+    for tf, rows in cross_rows.items():
+        if not rows:
+            continue
+        try:
+            pending_alerts.extend(scan_crosses(tf, cross_syms[tf], rows, plan.crosses[tf]))
+        except Exception as e:
+            log("ERR", f"scan_crosses [{tf}]: {type(e).__name__}: {e}")
+
     scan_time = time.monotonic() - t0
     log("SCAN",
         f"completed {len(tasks)} tasks in {scan_time:.1f}s | "
@@ -402,5 +673,3 @@ def poll_once(symbols: List[str]) -> None:
     for alert_str, cd_key, sym in pending_alerts:
         tg_send(alert_str)
         mark_cooldown(sym, cd_key)
-        if throttle > 0:
-            time.sleep(throttle)
@@ -13,12 +13,16 @@ Fixes vs original main.py:
 - HTTP: requests.Session + HTTPAdapter, explicit timeouts, retryable-only retry
 - HTTP: reset_http_session() for recovery after session corruption
 - Telegram: dedup key only registered after confirmed send
+- Telegram: tg_send queues to a worker thread that coalesces alerts (1s window)
 - Config: RLock (reentrant), handles FileNotFoundError + YAMLError explicitly
-- Cooldowns: time.monotonic() throughout (no clock-jump sensitivity)
+- Config: watchdog file events (start_config_watch) replace mtime polling when available
+- Cooldowns: time.monotonic_ns() integer compare (no clock-jump sensitivity)
 """
 
 import os
 import time
+import queue
+import atexit
 import random
 import hashlib
 import threading
@@ -27,7 +31,7 @@ import requests
 
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry as _UrllibRetry
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -40,24 +44,101 @@ def log(tag: str, msg: str) -> None:
 
 
 # ---------------------------------------------------------------------------
-# Config — thread-safe hot-reload via mtime check
+# Config — thread-safe hot-reload via file events (watchdog) or mtime check
 # ---------------------------------------------------------------------------
 
 _CONFIG_PATH  = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
 _config_lock  = threading.RLock()  # RLock: cfg() can be called inside load_config() safely
 _CONFIG: Dict[str, Any] = {}
-_CONFIG_MTIME: float     = 0.0
+_CONFIG_MTIME_NS: int    = 0      # st_mtime_ns — exact int compare, no float precision loss
+_CONFIG_CHECK_S          = 5.0    # min seconds between stat() calls (force=True bypasses)
+_config_next_check: float = 0.0   # monotonic deadline for the next stat()
+_config_generation: int   = 0     # bumped on every successful (re)load
+_CFG_DIRTY                = threading.Event()  # set by the watchdog handler on config.yaml events
+_cfg_observer: Any        = None  # watchdog Observer once start_config_watch() succeeds
+
+
+def start_config_watch() -> bool:
+    """
+    Watch config.yaml with watchdog (inotify/FSEvents/kqueue). While the
+    observer runs, load_config() only touches the file after an event.
+    Returns False — leaving mtime polling in place — if watchdog is not
+    installed or the observer cannot start. Idempotent.
+    """
+    global _cfg_observer
+    if _cfg_observer is not None:
+        return True
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        log("CFG", "watchdog not installed — config reload via mtime polling")
+        return False
+
+    class _Handler(FileSystemEventHandler):
+        # only writes count — opened/closed events (watchdog 6 on Linux) would
+        # let load_config's own read of config.yaml re-arm the flag
+        def on_modified(self, event) -> None:
+            self._mark(event)
+
+        def on_created(self, event) -> None:
+            self._mark(event)
+
+        def on_moved(self, event) -> None:
+            # editors often save via temp file + rename → check both paths
+            self._mark(event)
+
+        @staticmethod
+        def _mark(event) -> None:
+            paths = (getattr(event, "src_path", None), getattr(event, "dest_path", None))
+            if any(p and os.path.abspath(p) == _CONFIG_PATH for p in paths):
+                _CFG_DIRTY.set()
+
+    try:
+        observer = Observer()
+        observer.schedule(_Handler(), os.path.dirname(_CONFIG_PATH), recursive=False)
+        observer.daemon = True
+        observer.start()
+    except Exception as e:
+        log("CFG", f"watchdog start error — config reload via mtime polling: {type(e).__name__}: {e}")
+        return False
+
+    _cfg_observer = observer
+    _CFG_DIRTY.set()   # catch edits made before the observer was running
+    log("CFG", f"watching {_CONFIG_PATH} for changes")
+    return True
 
 
 def load_config(force: bool = False) -> None:
     """
     Reload config.yaml if the file's mtime changed, or if force=True.
+    With start_config_watch() active, non-forced calls return at once unless
+    a file event arrived; otherwise the file is stat()ed at most once every
+    _CONFIG_CHECK_S seconds and calls in between return immediately.
+    If the observer thread dies, load_config falls back to the mtime path.
     Thread-safe. No-op if nothing changed.
     Logs errors but never raises — caller loop must continue on config failures.
     """
-    global _CONFIG, _CONFIG_MTIME
+    global _CONFIG, _CONFIG_MTIME_NS, _config_next_check, _config_generation, _cfg_observer
+    if not force:
+        observer = _cfg_observer
+        if observer is not None and not observer.is_alive():
+            # inotify error, watched dir removed/remounted, ... — no more events
+            with _config_lock:
+                if _cfg_observer is observer:
+                    _cfg_observer = None
+                    log("CFG", "watchdog observer stopped — config reload via mtime polling")
+        if _cfg_observer is not None:
+            if not _CFG_DIRTY.is_set():
+                return
+            _CFG_DIRTY.clear()   # before reading: an edit during the read re-arms it
+        else:
+            now = time.monotonic()
+            if now < _config_next_check:
+                return
+            _config_next_check = now + _CONFIG_CHECK_S
     try:
-        mtime = os.path.getmtime(_CONFIG_PATH)
+        mtime_ns = os.stat(_CONFIG_PATH).st_mtime_ns
     except FileNotFoundError:
         log("CFG", f"ERROR config file not found: {_CONFIG_PATH}")
         return
@@ -66,14 +147,15 @@ def load_config(force: bool = False) -> None:
         return
 
     with _config_lock:
-        if not force and mtime == _CONFIG_MTIME:
+        if not force and mtime_ns == _CONFIG_MTIME_NS:
             return
         try:
             with open(_CONFIG_PATH, "r") as f:
                 data = yaml.safe_load(f) or {}
             _CONFIG       = data
-            _CONFIG_MTIME = mtime
-            log("CFG", f"Reloaded config (mtime={mtime:.0f})")
+            _CONFIG_MTIME_NS = mtime_ns
+            _config_generation += 1
+            log("CFG", f"Reloaded config (mtime={mtime_ns // 1_000_000_000})")
         except yaml.YAMLError as e:
             log("CFG", f"ERROR yaml parse — keeping previous config: {e}")
         except OSError as e:
@@ -82,6 +164,14 @@ def load_config(force: bool = False) -> None:
             log("CFG", f"ERROR unexpected in load_config: {type(e).__name__}: {e}")
 
 
+def config_generation() -> int:
+    """
+    Counter bumped on every successful config (re)load. Lets callers cache
+    values derived from config and rebuild them only when it changes.
+    """
+    return _config_generation
+
+
 def cfg(path: str, default: Any = None) -> Any:
     """
     Read a dot-separated key path from the loaded config.
@@ -243,6 +333,15 @@ def reset_http_session() -> None:
         log("HTTP", "session rebuilt")
 
 
+def get_http_session() -> requests.Session:
+    """
+    Shared keep-alive session for callers that need the raw Response
+    (e.g. exchangeInfo at boot) instead of http_call()'s text-or-None.
+    """
+    with _http_sess_lock:
+        return _http_session
+
+
 def _backoff_s(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
     """
     Full-jitter exponential backoff.
@@ -346,7 +445,7 @@ def http_post(url: str, json: Any = None, **kw) -> Optional[str]:
 
 
 # ---------------------------------------------------------------------------
-# Telegram — circuit breaker + dedup window to prevent double-alerts
+# Telegram — circuit breaker + dedup window + async coalescing sender
 # ---------------------------------------------------------------------------
 
 _tg_circuit   = Circuit(fail_threshold=3, cooldown_s=60, name="telegram")
@@ -354,6 +453,15 @@ _tg_lock      = threading.Lock()
 _tg_sent: Dict[str, float] = {}  # dedup_key → monotonic timestamp of confirmed send
 _TG_DEDUP_S   = 5.0              # suppress exact-duplicate messages within this window
 
+_TG_QUEUE_MAX  = 512             # pending alerts before tg_send starts dropping
+_TG_COALESCE_S = 1.0             # alerts queued within this window go out as one message
+_TG_MAX_CHARS  = 4096            # Telegram sendMessage text limit
+
+_tg_queue: "queue.Queue[str]" = queue.Queue(maxsize=_TG_QUEUE_MAX)
+_tg_worker: Optional[threading.Thread] = None
+_tg_inflight: List[str] = []     # taken off the queue, not yet sent — guarded by _tg_lock
+_tg_worker_lock = threading.Lock()
+
 
 def _tg_dedup_key(msg: str) -> str:
     """Short hash of message content — used as dedup key."""
@@ -371,85 +479,220 @@ def _tg_prune_sent() -> None:
         del _tg_sent[k]
 
 
-def tg_send(msg: str) -> bool:
+def _tg_chunks(msgs: List[str]) -> List[List[str]]:
+    """Group messages so each newline-joined group fits in one Telegram message."""
+    groups: List[List[str]] = []
+    size = 0
+    for msg in msgs:
+        if groups and size + 1 + len(msg) <= _TG_MAX_CHARS:
+            groups[-1].append(msg)
+            size += 1 + len(msg)
+        else:
+            groups.append([msg])
+            size = len(msg)
+    return groups
+
+
+def _tg_send_batch(msgs: List[str]) -> bool:
     """
-    Send a Telegram message with:
-    - dedup: same message within _TG_DEDUP_S seconds is dropped (after a confirmed send)
-    - circuit breaker: stops attempts when Telegram API is consistently down
-    - dedup key is only registered AFTER a confirmed successful send,
-      so failed sends don't block the next legitimate retry
+    Synchronously deliver msgs, newline-joined into as few Telegram
+    messages as fit. Applies dedup per original message and the circuit
+    breaker per HTTP post. Dedup keys are only registered AFTER a
+    confirmed send, so failed sends don't block the next legitimate retry.
 
-    Returns True on successful send, False on skip/failure.
+    Returns True if every non-duplicate message was sent.
     """
     token = os.getenv("TELEGRAM_BOT_TOKEN")
     chat  = os.getenv("TELEGRAM_CHAT_ID")
 
     if not token or not chat:
-        log("ALERT", msg)
+        for msg in msgs:
+            log("ALERT", msg)
         return False
 
-    key = _tg_dedup_key(msg)
-
     # Check dedup before doing any network call
+    fresh: Dict[str, str] = {}
     with _tg_lock:
         _tg_prune_sent()
-        if key in _tg_sent:
-            ago = time.monotonic() - _tg_sent[key]
-            log("TG", f"dedup skip (sent {ago:.1f}s ago): {msg[:40]}")
-            return False
-
-    if not _tg_circuit.allow():
-        log("TG", "SKIP circuit-open")
+        for msg in msgs:
+            key = _tg_dedup_key(msg)
+            if key in _tg_sent:
+                ago = time.monotonic() - _tg_sent[key]
+                log("TG", f"dedup skip (sent {ago:.1f}s ago): {msg[:40]}")
+            else:
+                fresh.setdefault(key, msg)
+    if not fresh:
         return False
 
     url    = f"https://api.telegram.org/bot{token}/sendMessage"
-    body   = {"chat_id": chat, "text": msg}
+    all_ok = True
+
+    for group in _tg_chunks(list(fresh.values())):
+        if not _tg_circuit.allow():
+            log("TG", f"SKIP circuit-open ({len(group)} msg)")
+            all_ok = False
+            continue
+
+        text   = "\n".join(group)
+        result = http_post(url, json={"chat_id": chat, "text": text}, timeout=6, retries=2)
+        ok     = result is not None
+
+        _tg_circuit.report(ok)
+
+        if ok:
+            # Register dedup ONLY on successful send
+            with _tg_lock:
+                now = time.monotonic()
+                for msg in group:
+                    _tg_sent[_tg_dedup_key(msg)] = now
+        else:
+            log("TG", f"FAILED to send ({len(group)} msg): {text[:60]}")
+            all_ok = False
 
-    log("RULE", f"alert | {msg[:80]}")
-    result = http_post(url, json=body, timeout=6, retries=2)
-    ok     = result is not None
+    return all_ok
 
-    _tg_circuit.report(ok)
 
-    if ok:
-        # Register dedup ONLY on successful send
-        with _tg_lock:
-            _tg_sent[key] = time.monotonic()
-    else:
-        log("TG", f"FAILED to send: {msg[:60]}")
+def _tg_hold(msg: str) -> None:
+    with _tg_lock:
+        _tg_inflight.append(msg)
 
-    return ok
+
+def _tg_take_inflight() -> List[str]:
+    global _tg_inflight
+    with _tg_lock:
+        batch, _tg_inflight = _tg_inflight, []
+    return batch
+
+
+def _tg_drain(first: str) -> List[str]:
+    """
+    Collect `first` plus everything queued within the coalesce window.
+    Messages sit in _tg_inflight while waiting, so the exit hook can still
+    send them if the process stops mid-window.
+    """
+    _tg_hold(first)
+    deadline = time.monotonic() + _TG_COALESCE_S
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            _tg_hold(_tg_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return _tg_take_inflight()
+
+
+def _tg_worker_loop() -> None:
+    """
+    Daemon: pulls queued alerts, coalesces them, sends. Never raises.
+    Paces posts at least telegram.throttle_sec apart; alerts queued during
+    the pause are merged into the next message instead of delaying callers.
+    """
+    while True:
+        batch = _tg_drain(_tg_queue.get())
+        t0    = time.monotonic()
+        try:
+            _tg_send_batch(batch)
+        except Exception as e:
+            log("TG", f"worker error: {type(e).__name__}: {e}")
+        try:
+            throttle = max(0.0, float(cfg("telegram.throttle_sec", 2.0)))
+        except (TypeError, ValueError):
+            throttle = 0.0
+        pause = throttle - (time.monotonic() - t0)
+        if pause > 0:
+            time.sleep(pause)
+
+
+def _tg_ensure_worker() -> None:
+    global _tg_worker
+    with _tg_worker_lock:
+        if _tg_worker is None or not _tg_worker.is_alive():
+            _tg_worker = threading.Thread(target=_tg_worker_loop, name="tg-sender", daemon=True)
+            _tg_worker.start()
+
+
+def _tg_flush_at_exit() -> None:
+    """
+    Best-effort: send whatever the worker is holding in its coalesce
+    window plus whatever is still queued when the process exits.
+    """
+    pending = _tg_take_inflight()
+    while True:
+        try:
+            pending.append(_tg_queue.get_nowait())
+        except queue.Empty:
+            break
+    if pending:
+        _tg_send_batch(pending)
+
+
+atexit.register(_tg_flush_at_exit)
+
+
+def tg_send(msg: str) -> bool:
+    """
+    Queue a Telegram alert and return immediately — never blocks the
+    caller's scan loop on the network. A background worker coalesces
+    alerts queued within _TG_COALESCE_S into one message and applies
+    dedup + circuit breaker (see _tg_send_batch).
+
+    Returns True if queued, False if skipped (no credentials) or dropped
+    (queue full).
+    """
+    if not os.getenv("TELEGRAM_BOT_TOKEN") or not os.getenv("TELEGRAM_CHAT_ID"):
+        log("ALERT", msg)
+        return False
+
+    _tg_ensure_worker()
+    try:
+        _tg_queue.put_nowait(msg)
+    except queue.Full:
+        log("TG", f"DROP queue full ({_TG_QUEUE_MAX}): {msg[:60]}")
+        return False
+
+    log("RULE", f"alert | {msg[:80]}")
+    return True
 
 
 def tg_ping(msg: str) -> bool:
-    """Alias for tg_send. Used for boot/health pings."""
-    return tg_send(msg)
+    """
+    Synchronous send for boot/health pings — these often precede a
+    shutdown, where a queued message could be lost with the daemon worker.
+    """
+    return _tg_send_batch([msg])
 
 
 # ---------------------------------------------------------------------------
 # Cooldowns — per (symbol, rule) throttle using monotonic clock
 # ---------------------------------------------------------------------------
 
-_cooldowns:     Dict[str, float] = {}
+_cooldowns:     Dict[Tuple[str, str], int] = {}  # (symbol, rule) → monotonic_ns of last fire
 _cooldown_lock: threading.Lock   = threading.Lock()
+_NS_PER_MIN = 60 * 1_000_000_000
 
 
 def on_cooldown(symbol: str, rule: str, cooldown_min: int) -> bool:
     """
     Return True if symbol:rule is still within its cooldown window.
     Uses monotonic clock — immune to system clock adjustments.
+    Integer ns throughout; a pair that never fired is never on cooldown
+    (a 0 default would read as "fired at boot" on a freshly booted host).
     """
-    key = f"{symbol}:{rule}"
+    key = (symbol, rule)
     with _cooldown_lock:
-        last = _cooldowns.get(key, 0.0)
-    return (time.monotonic() - last) < (cooldown_min * 60.0)
+        last = _cooldowns.get(key)
+    if last is None:
+        return False
+    return (time.monotonic_ns() - last) < int(cooldown_min * _NS_PER_MIN)
 
 
 def mark_cooldown(symbol: str, rule: str) -> None:
     """Record that symbol:rule fired right now."""
-    key = f"{symbol}:{rule}"
+    key = (symbol, rule)
     with _cooldown_lock:
-        _cooldowns[key] = time.monotonic()
+        _cooldowns[key] = time.monotonic_ns()
 
 
 def clear_cooldowns() -> None: